@@ -0,0 +1,167 @@
+"""
+Fixed-size ring buffer of int16 audio frames
+
+Shared between a sounddevice callback (producer) and a decoder thread
+(consumer). Storage is allocated once up front, so memory stays bounded when
+decoding falls behind real time; what happens to new audio when the buffer is
+full is decided by the overflow policy.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class AudioRingBuffer:
+    """
+    Preallocated ring buffer of mono int16 frames
+
+    Args:
+        capacity: Buffer size in frames
+        sample_rate: Sample rate in Hz, used to report lag in seconds
+        overflow: One of "drop_oldest", "drop_newest" or "block"
+        block_timeout: With "block", longest time (seconds) a writer waits for
+            space before falling back to dropping the newest frames. Keep this
+            short when writing from an audio callback.
+    """
+
+    def __init__(self, capacity, sample_rate=16000, overflow=DROP_OLDEST, block_timeout=0.1):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.capacity = int(capacity)
+        self.sample_rate = sample_rate
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self._data = np.zeros(self.capacity, dtype=np.int16)
+        self._read_pos = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.overruns = 0
+        self.dropped_frames = 0
+        self.frames_written = 0
+        self.frames_read = 0
+        self.high_water = 0
+
+    @classmethod
+    def for_duration(cls, seconds, sample_rate=16000, **kwargs):
+        return cls(int(seconds * sample_rate), sample_rate=sample_rate, **kwargs)
+
+    def _copy_in(self, frames):
+        start = (self._read_pos + self._size) % self.capacity
+        first = min(len(frames), self.capacity - start)
+        self._data[start:start + first] = frames[:first]
+        self._data[:len(frames) - first] = frames[first:]
+        self._size += len(frames)
+
+    def _discard(self, count):
+        self._read_pos = (self._read_pos + count) % self.capacity
+        self._size -= count
+
+    def write(self, data):
+        """
+        Append raw int16 PCM (bytes, buffer or ndarray)
+
+        Returns:
+            int: Number of frames actually stored
+        """
+        frames = np.frombuffer(data, dtype=np.int16) if not isinstance(data, np.ndarray) else data
+        frames = frames.reshape(-1)
+
+        with self._cond:
+            if self._closed:
+                return 0
+            self.frames_written += len(frames)
+
+            free = self.capacity - self._size
+            if len(frames) > free and self.overflow == BLOCK:
+                deadline = time.monotonic() + self.block_timeout
+                while len(frames) > self.capacity - self._size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                free = self.capacity - self._size
+
+            if len(frames) > free:
+                self.overruns += 1
+                if self.overflow == DROP_OLDEST:
+                    # A write larger than the whole buffer keeps only its tail
+                    if len(frames) > self.capacity:
+                        self.dropped_frames += len(frames) - self.capacity
+                        frames = frames[-self.capacity:]
+                    self._discard(len(frames) - free)
+                    self.dropped_frames += len(frames) - free
+                else:
+                    self.dropped_frames += len(frames) - free
+                    frames = frames[:free]
+
+            self._copy_in(frames)
+            self.high_water = max(self.high_water, self._size)
+            self._cond.notify_all()
+            return len(frames)
+
+    def read(self, frames, timeout=None):
+        """
+        Read up to `frames` frames as bytes, waiting until that many are
+        buffered, the timeout expires or the buffer is closed
+
+        Requests larger than the buffer are clamped to its capacity.
+
+        Returns:
+            bytes: PCM data, possibly shorter than requested (empty on
+            timeout or once closed and drained)
+        """
+        frames = min(frames, self.capacity)
+        with self._cond:
+            self._cond.wait_for(lambda: self._size >= frames or self._closed, timeout)
+            count = min(frames, self._size)
+            start = self._read_pos
+            first = min(count, self.capacity - start)
+            out = self._data[start:start + first].tobytes()
+            if count > first:
+                out += self._data[:count - first].tobytes()
+            self._discard(count)
+            self.frames_read += count
+            self._cond.notify_all()
+            return out
+
+    def close(self):
+        """Wake any waiting reader/writer; buffered frames can still be read"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def lag_seconds(self):
+        """Audio buffered but not yet consumed by the decoder, in seconds"""
+        return self._size / float(self.sample_rate)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "buffered": self._size,
+                "lag_seconds": self._size / float(self.sample_rate),
+                "high_water": self.high_water,
+                "overruns": self.overruns,
+                "dropped_frames": self.dropped_frames,
+                "frames_written": self.frames_written,
+                "frames_read": self.frames_read,
+                "overflow": self.overflow,
+            }
@@ -2,8 +2,8 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
 import pyttsx3
-from translator import translate_to_hindi
 from nlp_processor import NLPProcessor
+from pipeline import TranslationPipeline
 
 # Try to import speech recognition
 try:
@@ -23,6 +23,7 @@ class AudioTranslatorGUI:
         
         # Initialize components
         self.nlp_processor = NLPProcessor()
+        self.pipeline = TranslationPipeline(self.nlp_processor)
         self.tts_engine = pyttsx3.init()
         self.tts_engine.setProperty('rate', 150)
         
@@ -248,27 +249,37 @@ class AudioTranslatorGUI:
     def _translate_worker(self, text):
         """Worker thread for translation"""
         try:
-            # Translate
-            hindi = translate_to_hindi(text)
+            # Translate and analyze concurrently
+            translation, analysis, _ = self.pipeline.submit(text)
             
-            # Update Hindi text
+            # Update Hindi text as soon as the translation is ready
+            hindi = translation.result()["hindi"]
             self.hindi_text.config(state=tk.NORMAL)
             self.hindi_text.delete(1.0, tk.END)
             self.hindi_text.insert(1.0, hindi)
             self.hindi_text.config(state=tk.DISABLED)
             
-            # Perform NLP analysis
-            self.analyze_text(text)
-            
             self.update_status("✅ Translation complete!", '#2ecc71')
         except Exception as e:
             self.update_status(f"❌ Translation error: {str(e)}", '#e74c3c')
+            return
+        
+        # An analysis failure must not affect the translation
+        try:
+            self.show_analysis(analysis.result())
+        except Exception as e:
+            print(f"NLP Analysis error: {e}")
     
     def analyze_text(self, text):
         """Perform NLP analysis on text"""
         try:
-            analysis = self.nlp_processor.process(text)
-            
+            self.show_analysis(self.nlp_processor.process(text))
+        except Exception as e:
+            print(f"NLP Analysis error: {e}")
+    
+    def show_analysis(self, analysis):
+        """Display an NLP analysis result"""
+        try:
             # Format analysis output
             output = "="*50 + "\n"
             output += "TEXT ANALYSIS\n"
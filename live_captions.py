@@ -0,0 +1,225 @@
+"""
+Live Hindi captions from growing ASR partial hypotheses
+
+KaldiRecognizer.PartialResult() grows word by word. Re-translating the whole
+hypothesis on every update is too slow, so IncrementalTranslator:
+
+- treats words that stayed unchanged over the last few partials as stable,
+- translates and commits stable chunks once (committed Hindi only changes
+  if the recognizer later revises the words it was built from),
+- re-translates only the short uncommitted suffix on later updates, and
+- rate-limits updates so CPU cost stays bounded.
+
+Usage:
+    python live_captions.py
+"""
+
+import json
+import time
+from collections import OrderedDict
+
+
+class IncrementalTranslator:
+    """
+    Incremental (simultaneous) translation of a growing source hypothesis
+
+    Args:
+        translate_fn: Callable mapping a list of English strings to a list of
+            Hindi strings (defaults to translator.translate_batch)
+        stable_updates: Partials a word must survive unchanged to be stable
+        commit_words: Stable words needed before a chunk is committed
+        max_tentative_words: Force a commit once the uncommitted suffix
+            grows beyond this, keeping per-update work bounded
+        min_interval: Minimum seconds between re-translations
+        cache_size: Suffix translations kept to avoid re-running the encoder
+            on text that has not changed
+    """
+
+    def __init__(self, translate_fn=None, stable_updates=2, commit_words=6,
+                 max_tentative_words=16, min_interval=0.5, cache_size=64):
+        if translate_fn is None:
+            from translator import translate_batch
+            translate_fn = translate_batch
+        self.translate_fn = translate_fn
+        self.stable_updates = stable_updates
+        self.commit_words = commit_words
+        self.max_tentative_words = max_tentative_words
+        self.min_interval = min_interval
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self.translations = 0
+        self.skipped_updates = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance"""
+        self._history = []
+        self._chunks = []
+        self._tentative_hindi = ""
+        self._last_source = None
+        self._last_update = 0.0
+
+    def _translate(self, text):
+        if not text:
+            return ""
+        if text in self._cache:
+            self._cache.move_to_end(text)
+            return self._cache[text]
+        hindi = self.translate_fn([text])[0]
+        self.translations += 1
+        self._cache[text] = hindi
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return hindi
+
+    def _stable_prefix_length(self, words):
+        """Length of the word prefix shared by the current and recent partials"""
+        recent = self._history[:-1]
+        length = len(words)
+        for previous in recent:
+            common = 0
+            for a, b in zip(words, previous):
+                if a != b:
+                    break
+                common += 1
+            length = min(length, common)
+        return length if len(recent) >= self.stable_updates - 1 else 0
+
+    @property
+    def _committed_source(self):
+        return [w for chunk, _ in self._chunks for w in chunk]
+
+    @property
+    def _committed_words(self):
+        return sum(len(chunk) for chunk, _ in self._chunks)
+
+    def _rollback(self, words):
+        """Drop committed chunks whose source words the recognizer revised"""
+        while self._chunks and words[:self._committed_words] != self._committed_source:
+            self._chunks.pop()
+
+    def _commit(self, words, end):
+        chunk = words[self._committed_words:end]
+        if chunk:
+            self._chunks.append((chunk, self._translate(" ".join(chunk))))
+
+    @property
+    def committed(self):
+        return " ".join(h for _, h in self._chunks if h)
+
+    @property
+    def caption(self):
+        """Committed Hindi followed by the current tentative suffix"""
+        return " ".join(h for h in (self.committed, self._tentative_hindi) if h)
+
+    def update(self, partial_text, now=None):
+        """
+        Feed the latest partial hypothesis
+
+        Returns:
+            str: Updated caption, or None if the update was rate-limited or
+            the hypothesis did not change
+        """
+        now = time.monotonic() if now is None else now
+        words = partial_text.split()
+        self._history.append(words)
+        del self._history[:-self.stable_updates]
+
+        if partial_text == self._last_source:
+            return None
+        if now - self._last_update < self.min_interval:
+            self.skipped_updates += 1
+            return None
+        self._last_source = partial_text
+        self._last_update = now
+
+        # A revised prefix invalidates the chunks committed from it
+        self._rollback(words)
+        stable = self._stable_prefix_length(words)
+        if stable - self._committed_words >= self.commit_words:
+            self._commit(words, stable)
+        elif len(words) - self._committed_words > self.max_tentative_words:
+            self._commit(words, max(stable, len(words) - self.commit_words))
+
+        suffix = " ".join(words[self._committed_words:])
+        self._tentative_hindi = self._translate(suffix)
+        return self.caption
+
+    def finalize(self, final_text):
+        """
+        Finish the utterance with the recognizer's final text
+
+        Returns:
+            str: Full Hindi caption for the utterance
+        """
+        words = final_text.split()
+        self._rollback(words)
+        self._commit(words, len(words))
+        self._tentative_hindi = ""
+        caption = self.committed
+        self.reset()
+        return caption
+
+    def stats(self):
+        return {
+            "translations": self.translations,
+            "skipped_updates": self.skipped_updates,
+            "committed_words": self._committed_words,
+        }
+
+
+def run_live_captions(vosk_path="models/vosk_model", on_caption=None, **translator_kwargs):
+    """
+    Caption the microphone live until interrupted
+
+    on_caption(caption, final) is called for each update; by default the
+    caption is printed.
+    """
+    import sounddevice as sd
+    from audio_buffer import AudioRingBuffer
+    from vosk_models import load_vosk_model, make_recognizer, strip_unknown
+
+    model = load_vosk_model(vosk_path)
+    if model is None:
+        return
+
+    if on_caption is None:
+        def on_caption(caption, final):
+            print(f"{'✓' if final else '…'} {caption}")
+
+    recognizer = make_recognizer(model, 16000)
+    incremental = IncrementalTranslator(**translator_kwargs)
+    audio_buffer = AudioRingBuffer.for_duration(5, 16000)
+
+    def callback(indata, frames, time_info, status):
+        if status:
+            print(f"Status: {status}")
+        audio_buffer.write(indata)
+
+    print("\n🎤 Live captions started (Ctrl+C to stop)")
+    try:
+        with sd.RawInputStream(samplerate=16000, blocksize=4000, dtype='int16',
+                               channels=1, callback=callback):
+            while True:
+                data = audio_buffer.read(4000)
+                if recognizer.AcceptWaveform(data):
+                    text = strip_unknown(json.loads(recognizer.Result()).get("text", ""))
+                    if text:
+                        on_caption(incremental.finalize(text), True)
+                    else:
+                        incremental.reset()
+                else:
+                    partial = strip_unknown(json.loads(recognizer.PartialResult()).get("partial", ""))
+                    if partial:
+                        caption = incremental.update(partial)
+                        if caption is not None:
+                            on_caption(caption, False)
+    except KeyboardInterrupt:
+        print("\n👋 Live captions stopped")
+    finally:
+        audio_buffer.close()
+
+
+if __name__ == "__main__":
+    run_live_captions()
@@ -1,5 +1,5 @@
 from translator import translate_to_hindi
-from speech_to_text import recognize_speech
+from speech_to_text import recognize_speech, match_command
 import pyttsx3
 
 def speak(text):
@@ -8,13 +8,15 @@ def speak(text):
     engine.say(text)
     engine.runAndWait()
 
+EXIT_COMMANDS = ["stop"]
+
 def main():
     while True:
         print("\n----------------------------------")
         print("🎤 Speak in English (say 'stop' to exit)")
         print("----------------------------------")
 
-        english_text = recognize_speech()
+        english_text = recognize_speech(commands=EXIT_COMMANDS)
 
         if not english_text:
             print("❌ Could not understand. Try again.")
@@ -22,7 +24,7 @@ def main():
 
         print(f"🗣 You said: {english_text}")
 
-        if "stop" in english_text.lower():
+        if match_command(english_text, EXIT_COMMANDS):
             print("👋 Exiting translator.")
             break
 
@@ -11,15 +11,43 @@ from collections import Counter
 class NLPProcessor:
     def __init__(self):
         self.nlp = None
+        self.sentencizer = None
         if SPACY_AVAILABLE:
+            # Rule-based sentence splitter: no tagger/parser/NER, so it is
+            # cheap enough to run before translation starts
+            self.sentencizer = spacy.blank("en")
+            self.sentencizer.add_pipe("sentencizer")
             try:
                 self.nlp = spacy.load("en_core_web_sm")
             except OSError:
                 print("SpaCy model 'en_core_web_sm' not found.")
                 print("Install it using: python -m spacy download en_core_web_sm")
 
-    def process(self, text):
-        """Process text and extract linguistic features"""
+    def parse(self, text):
+        """Run the spaCy pipeline once; returns a Doc or None without spaCy"""
+        if self.nlp and text and text.strip():
+            return self.nlp(text)
+        return None
+
+    def split_sentences(self, text, doc=None):
+        """
+        Split text into sentences
+
+        Uses a parsed Doc when given, otherwise the lightweight spaCy
+        sentencizer (or a regex without spaCy); never runs the full pipeline.
+        """
+        if doc is None and self.sentencizer is not None and text and text.strip():
+            doc = self.sentencizer(text)
+        if doc is not None:
+            return [sent.text.strip() for sent in doc.sents if sent.text.strip()]
+        return [s.strip() for s in re.findall(r'[^.!?]+[.!?]*', text or "") if s.strip()]
+
+    def process(self, text, doc=None):
+        """
+        Process text and extract linguistic features
+
+        Pass a Doc from parse() to reuse an existing spaCy run.
+        """
         if not text or text.strip() == "":
             return {
                 "original_text": "",
@@ -40,7 +68,8 @@ class NLPProcessor:
         }
 
         if self.nlp:
-            doc = self.nlp(text)
+            if doc is None:
+                doc = self.nlp(text)
             
             # Extract keywords (non-stop words, alphabetic tokens)
             result["keywords"] = [
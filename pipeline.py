@@ -0,0 +1,97 @@
+"""
+Concurrent NLP analysis and translation
+
+Translation and analysis start at the same time. Translation splits the text
+with the lightweight spaCy sentencizer (rule-based, no tagger/parser/NER) and
+translates sentence-level batches, while the full spaCy pipeline and keyword,
+entity and POS extraction run in parallel, so end-to-end latency is roughly
+max(MT, NLP) instead of MT + NLP.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nlp_processor import NLPProcessor
+from translator import translate_batch
+
+
+class TranslationPipeline:
+    """
+    Run NLPProcessor.process and Hindi translation side by side
+
+    Args:
+        nlp_processor: Existing NLPProcessor to reuse (one is created if None)
+        batch_size: Sentences per translation batch
+    """
+
+    def __init__(self, nlp_processor=None, batch_size=8):
+        self.nlp_processor = nlp_processor or NLPProcessor()
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline")
+
+    def _analyze(self, text, timings):
+        start = time.perf_counter()
+        analysis = self.nlp_processor.process(text)
+        timings["nlp"] = time.perf_counter() - start
+        return analysis
+
+    def _translate(self, text, timings):
+        start = time.perf_counter()
+        sentences = self.nlp_processor.split_sentences(text)
+        hindi = translate_batch(sentences, batch_size=self.batch_size)
+        timings["translation"] = time.perf_counter() - start
+        return {
+            "english": text,
+            "hindi": " ".join(h for h in hindi if h),
+            "sentences": [{"english": e, "hindi": h} for e, h in zip(sentences, hindi)],
+        }
+
+    def submit(self, text):
+        """
+        Start translation and analysis concurrently
+
+        Returns:
+            tuple: (translation_future, analysis_future, timings). The
+            translation future resolves to {"english", "hindi", "sentences"},
+            the analysis future to the NLPProcessor.process() dict; each can
+            be consumed (and can fail) independently.
+        """
+        timings = {}
+        translation = self._executor.submit(self._translate, text, timings)
+        analysis = self._executor.submit(self._analyze, text, timings)
+        return translation, analysis, timings
+
+    def run(self, text):
+        """
+        Analyze and translate text concurrently
+
+        Returns:
+            dict: {"english", "hindi", "sentences", "analysis",
+            "analysis_error", "timings"}. A failed analysis is reported in
+            analysis_error instead of discarding the translation.
+        """
+        if not text or text.strip() == "":
+            return {
+                "english": "",
+                "hindi": "",
+                "sentences": [],
+                "analysis": self.nlp_processor.process(text),
+                "analysis_error": None,
+                "timings": {},
+            }
+
+        start = time.perf_counter()
+        translation, analysis, timings = self.submit(text)
+        result = translation.result()
+        try:
+            result["analysis"] = analysis.result()
+            result["analysis_error"] = None
+        except Exception as e:
+            result["analysis"] = None
+            result["analysis_error"] = str(e)
+        timings["total"] = time.perf_counter() - start
+        result["timings"] = timings
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
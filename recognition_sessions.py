@@ -0,0 +1,379 @@
+"""
+Concurrent speech recognition sessions over one shared Vosk model
+
+Each session (a live input device or a pushed byte stream) owns its own
+KaldiRecognizer, but all of them share a single loaded Model. Decoding is
+scheduled on a thread pool: a session is queued for decoding whenever it has
+pending audio, and at most one worker decodes a given session at a time
+because a KaldiRecognizer is not thread-safe.
+"""
+
+import collections
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from vosk_models import load_vosk_model, make_recognizer, match_command, strip_unknown
+
+try:
+    from vosk import KaldiRecognizer  # noqa: F401
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+    print("Warning: Vosk not available")
+
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError: sounddevice is installed but the PortAudio library is missing
+    SOUNDDEVICE_AVAILABLE = False
+
+
+class RecognitionSession:
+    """One independent audio stream decoded against the shared model"""
+
+    def __init__(self, session_id, manager, recognizer, sample_rate=16000,
+                 on_result=None, on_partial=None, phrases=None,
+                 command_recognizer=None, command_phrases=None, on_command=None,
+                 max_backlog_seconds=10):
+        self.session_id = session_id
+        self.sample_rate = sample_rate
+        self.on_result = on_result
+        self.on_partial = on_partial
+        self.on_command = on_command
+        self.phrases = phrases
+        self.command_phrases = command_phrases
+        self.results = []
+        self.commands = []
+        self.partial = ""
+
+        self._manager = manager
+        self._recognizer = recognizer
+        self._command_recognizer = command_recognizer
+        self._pending = collections.deque()
+        self._pending_bytes = 0
+        self._max_pending_bytes = int(max_backlog_seconds * 2 * sample_rate)
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._closed = False
+        self._stream = None
+
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.bytes_dropped = 0
+        self._oldest_pending_at = None
+
+    def push(self, data):
+        """Queue raw int16 mono PCM for decoding"""
+        if self._closed:
+            raise RuntimeError(f"Session {self.session_id} is closed")
+        data = bytes(data)
+        with self._lock:
+            if not self._pending:
+                self._oldest_pending_at = time.monotonic()
+            self._pending.append((time.monotonic(), data))
+            self._pending_bytes += len(data)
+            self.bytes_received += len(data)
+            self._trim_backlog()
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            self._manager._submit(self)
+
+    def _trim_backlog(self):
+        """Drop the oldest undecoded audio once the backlog exceeds its limit"""
+        while self._pending_bytes > self._max_pending_bytes:
+            audio = [i for i, (_, d) in enumerate(self._pending) if not isinstance(d, tuple)]
+            if len(audio) <= 1:
+                break
+            _, data = self._pending[audio[0]]
+            del self._pending[audio[0]]
+            self._pending_bytes -= len(data)
+            self.bytes_dropped += len(data)
+        self._oldest_pending_at = self._pending[0][0] if self._pending else None
+
+    def set_mode(self, phrases=None):
+        """
+        Switch between dictation (phrases=None) and grammar-constrained mode
+
+        The switch is queued behind audio already pushed, so earlier audio is
+        decoded in the old mode. Only a new recognizer is built; the shared
+        model is not reloaded.
+        """
+        recognizer = make_recognizer(self._manager.model, self.sample_rate, phrases)
+        with self._lock:
+            if not self._pending:
+                self._oldest_pending_at = time.monotonic()
+            self._pending.append((time.monotonic(), (recognizer, phrases)))
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            self._manager._submit(self)
+
+    def _switch(self, recognizer, phrases):
+        self._emit_result(self._recognizer.FinalResult())
+        self._recognizer = recognizer
+        self.phrases = phrases
+
+    def _drain(self, max_chunks):
+        """Decode up to max_chunks pending chunks; called from a pool worker"""
+        for _ in range(max_chunks):
+            with self._lock:
+                if not self._pending:
+                    self._scheduled = False
+                    self._oldest_pending_at = None
+                    return
+                _, data = self._pending.popleft()
+                if not isinstance(data, tuple):
+                    self._pending_bytes -= len(data)
+                self._oldest_pending_at = self._pending[0][0] if self._pending else None
+
+            try:
+                if isinstance(data, tuple):
+                    self._switch(*data)
+                else:
+                    self._decode(data)
+            except Exception as e:
+                # A bad chunk must not stall the rest of the stream
+                print(f"Error decoding audio in session {self.session_id}: {e}")
+            finally:
+                if not isinstance(data, tuple):
+                    with self._lock:
+                        self.bytes_decoded += len(data)
+
+        # Yield the worker so other sessions get a turn, then continue
+        self._reschedule()
+
+    def _decode(self, data):
+        if self._command_recognizer is not None:
+            if self._command_recognizer.AcceptWaveform(data):
+                self._emit_command(self._command_recognizer.Result())
+
+        if self._recognizer.AcceptWaveform(data):
+            self._emit_result(self._recognizer.Result())
+        elif self.on_partial:
+            partial = strip_unknown(json.loads(self._recognizer.PartialResult()).get("partial", ""))
+            if partial != self.partial:
+                self.partial = partial
+                self._callback(self.on_partial, self.session_id, partial)
+
+    def _reschedule(self):
+        """Queue the session again if audio is left, else mark it idle"""
+        with self._lock:
+            if self._pending:
+                resubmit = True
+            else:
+                self._scheduled = False
+                self._oldest_pending_at = None
+                resubmit = False
+        if resubmit:
+            self._manager._submit(self)
+
+    def _callback(self, fn, *args):
+        """Invoke a user callback; its errors are reported, not propagated"""
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Error in callback for session {self.session_id}: {e}")
+
+    def _emit_result(self, result_json):
+        result = json.loads(result_json)
+        text = strip_unknown(result.get("text", ""))
+        self.partial = ""
+        if not text:
+            return
+        self.results.append(text)
+        if self.on_result:
+            self._callback(self.on_result, self.session_id, text, result)
+
+    def _emit_command(self, result_json):
+        text = strip_unknown(json.loads(result_json).get("text", ""))
+        command = match_command(text, self.command_phrases) if text else None
+        if command is None:
+            return
+        self.commands.append(command)
+        if self.on_command:
+            self._callback(self.on_command, self.session_id, command)
+
+    @property
+    def lag_seconds(self):
+        """Seconds of received audio that have not been decoded yet"""
+        with self._lock:
+            pending = self.bytes_received - self.bytes_decoded - self.bytes_dropped
+        return pending / (2.0 * self.sample_rate)
+
+    @property
+    def wall_lag_seconds(self):
+        """Wall-clock age of the oldest audio chunk still waiting to be decoded"""
+        with self._lock:
+            oldest = self._oldest_pending_at
+        return 0.0 if oldest is None else time.monotonic() - oldest
+
+    def stats(self):
+        return {
+            "session_id": self.session_id,
+            "audio_seconds": self.bytes_received / (2.0 * self.sample_rate),
+            "decoded_seconds": self.bytes_decoded / (2.0 * self.sample_rate),
+            "dropped_seconds": self.bytes_dropped / (2.0 * self.sample_rate),
+            "lag_seconds": self.lag_seconds,
+            "wall_lag_seconds": self.wall_lag_seconds,
+            "results": len(self.results),
+            "mode": "grammar" if self.phrases else "dictation",
+        }
+
+    def _finish(self, timeout=None):
+        """Stop input, wait for pending audio to decode and flush the final result"""
+        # Stop the device first so its callback never pushes into a closed session
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self._closed = True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                busy = self._scheduled or bool(self._pending)
+                if busy and deadline is not None and time.monotonic() > deadline:
+                    # Give up on undecoded audio; the worker still owns the
+                    # recognizer, so it must not be flushed from this thread
+                    self.bytes_dropped += sum(len(d) for _, d in self._pending
+                                              if not isinstance(d, tuple))
+                    self._pending.clear()
+                    self._pending_bytes = 0
+                    return " ".join(self.results)
+            if not busy:
+                break
+            time.sleep(0.01)
+
+        self._emit_result(self._recognizer.FinalResult())
+        if self._command_recognizer is not None:
+            self._emit_command(self._command_recognizer.FinalResult())
+        return " ".join(self.results)
+
+
+class SessionManager:
+    """
+    Manage many recognition sessions sharing one Vosk model
+
+    Args:
+        vosk_path: Path to Vosk model
+        max_workers: Decoder threads shared by all sessions
+        chunks_per_turn: Chunks a worker decodes for one session before
+            yielding to the next queued session
+    """
+
+    def __init__(self, vosk_path="models/vosk_model", max_workers=4, chunks_per_turn=4):
+        if not VOSK_AVAILABLE:
+            raise RuntimeError("Speech recognition not available (vosk not installed)")
+        self.model = load_vosk_model(vosk_path)
+        if self.model is None:
+            raise RuntimeError(f"Vosk model not found at {vosk_path}")
+
+        self.chunks_per_turn = chunks_per_turn
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="vosk-decode")
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _submit(self, session):
+        self._executor.submit(self._run, session)
+
+    def _run(self, session):
+        try:
+            session._drain(self.chunks_per_turn)
+        except Exception as e:
+            print(f"Error in recognition session {session.session_id}: {e}")
+            session._reschedule()
+
+    def open_session(self, session_id=None, sample_rate=16000,
+                     on_result=None, on_partial=None, phrases=None,
+                     command_phrases=None, on_command=None, max_backlog_seconds=10):
+        """
+        Open a session fed with push(); returns the RecognitionSession
+
+        Callbacks are invoked from decoder threads as
+        on_result(session_id, text, result_dict),
+        on_partial(session_id, partial_text) and
+        on_command(session_id, command).
+
+        phrases restricts the main recognizer to a grammar instead of open
+        dictation. command_phrases runs a second, grammar-constrained
+        recognizer alongside it on the same audio to spot control words.
+
+        At most max_backlog_seconds of undecoded audio is kept per session;
+        when decoding falls behind, the oldest audio is dropped and counted
+        in bytes_dropped.
+        """
+        recognizer = make_recognizer(self.model, sample_rate, phrases)
+        command_recognizer = None
+        if command_phrases:
+            command_recognizer = make_recognizer(self.model, sample_rate, command_phrases)
+        with self._lock:
+            if session_id is None:
+                session_id = f"session-{next(self._ids)}"
+            if session_id in self._sessions:
+                raise ValueError(f"Session {session_id} already exists")
+            session = RecognitionSession(session_id, self, recognizer, sample_rate,
+                                         max_backlog_seconds=max_backlog_seconds,
+                                         on_result=on_result, on_partial=on_partial,
+                                         phrases=phrases,
+                                         command_recognizer=command_recognizer,
+                                         command_phrases=command_phrases,
+                                         on_command=on_command)
+            self._sessions[session_id] = session
+        return session
+
+    def open_device_session(self, device=None, session_id=None, sample_rate=16000,
+                            blocksize=8000, **session_kwargs):
+        """Open a session fed from a live sounddevice input device"""
+        if not SOUNDDEVICE_AVAILABLE:
+            raise RuntimeError("sounddevice not available")
+        session = self.open_session(session_id, sample_rate, **session_kwargs)
+
+        def callback(indata, frames, time_info, status):
+            if status:
+                print(f"Status ({session.session_id}): {status}")
+            session.push(indata)
+
+        stream = sd.RawInputStream(
+            samplerate=sample_rate,
+            blocksize=blocksize,
+            device=device,
+            dtype='int16',
+            channels=1,
+            callback=callback
+        )
+        session._stream = stream
+        stream.start()
+        return session
+
+    def get(self, session_id):
+        return self._sessions[session_id]
+
+    def close_session(self, session_id, timeout=None):
+        """Close a session and return its full transcript"""
+        with self._lock:
+            session = self._sessions.pop(session_id)
+        return session._finish(timeout)
+
+    def stats(self):
+        """Per-session throughput and lag behind real time"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [s.stats() for s in sessions]
+
+    def shutdown(self):
+        for session_id in list(self._sessions):
+            self.close_session(session_id, timeout=5)
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
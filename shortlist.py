@@ -0,0 +1,223 @@
+"""
+Lexical shortlist for Marian decoding
+
+At every decoding step the Marian output layer projects onto all
+`decoder_vocab_size` (61,950) target tokens. A shortlist restricts that
+projection to the target tokens that plausibly translate the source tokens
+in the current batch, taken from a source-to-target co-occurrence table
+built once from a parallel corpus.
+
+Usage:
+    python shortlist.py build --src corpus.en --tgt corpus.hi [--top-k 50]
+    python shortlist.py check --src sample.en [--shortlist path]
+"""
+
+import argparse
+import copy
+import os
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+import torch
+from torch import nn
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir) if 'src' in current_dir else current_dir
+DEFAULT_SHORTLIST_PATH = os.path.join(project_root, "models", "opus-mt-en-hi", "shortlist.npz")
+
+
+class Shortlist:
+    """
+    Source-to-target token co-occurrence table in CSR form
+
+    Args:
+        indptr: Row offsets, one row per source token id
+        indices: Candidate target ids for each source token
+        frequent: Target ids that are always kept (most frequent tokens
+            plus special tokens)
+    """
+
+    def __init__(self, indptr, indices, frequent):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.frequent = np.asarray(frequent, dtype=np.int64)
+
+    @classmethod
+    def load(cls, path=DEFAULT_SHORTLIST_PATH):
+        data = np.load(path)
+        return cls(data["indptr"], data["indices"], data["frequent"])
+
+    def save(self, path=DEFAULT_SHORTLIST_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, indptr=self.indptr, indices=self.indices,
+                            frequent=self.frequent)
+
+    def candidates(self, input_ids):
+        """Sorted union of target candidates for every source id in a batch"""
+        source_ids = np.unique(np.asarray(input_ids).reshape(-1))
+        source_ids = source_ids[source_ids < len(self.indptr) - 1]
+        rows = [self.indices[self.indptr[i]:self.indptr[i + 1]] for i in source_ids]
+        return np.unique(np.concatenate([self.frequent] + rows))
+
+
+def build_shortlist(source_texts, target_texts, tokenizer, top_k=50,
+                    frequent_k=200, vocab_size=None):
+    """
+    Build a Shortlist from aligned source/target sentences
+
+    For each source token the top_k target tokens it co-occurs with most
+    often (sentence-level bag of words) are kept. The frequent_k most common
+    target tokens and the tokenizer's special tokens are always kept.
+    """
+    vocab_size = vocab_size or len(tokenizer)
+    cooc = defaultdict(Counter)
+    target_freq = Counter()
+
+    for src, tgt in zip(source_texts, target_texts):
+        src_ids = set(tokenizer(src, truncation=True)["input_ids"])
+        tgt_ids = set(tokenizer(text_target=tgt, truncation=True)["input_ids"])
+        target_freq.update(tgt_ids)
+        for s in src_ids:
+            cooc[s].update(tgt_ids)
+
+    indptr = [0]
+    indices = []
+    for source_id in range(vocab_size):
+        row = sorted(t for t, _ in cooc[source_id].most_common(top_k)) if source_id in cooc else []
+        indices.extend(row)
+        indptr.append(len(indices))
+
+    specials = [tokenizer.eos_token_id, tokenizer.unk_token_id]
+    frequent = sorted({t for t, _ in target_freq.most_common(frequent_k)} |
+                      {t for t in specials if t is not None})
+    return Shortlist(indptr, indices, frequent)
+
+
+class ShortlistProjection(nn.Module):
+    """
+    Output projection restricted to a candidate set
+
+    Computes logits only for the candidate rows of the full projection and
+    scatters them into a full-vocabulary tensor filled with -inf, so token
+    ids (and everything downstream in generate) stay unchanged.
+    """
+
+    def __init__(self, full_projection, candidate_ids):
+        super().__init__()
+        self.vocab_size = full_projection.weight.shape[0]
+        self.register_buffer("candidate_ids", candidate_ids)
+        self.weight = nn.Parameter(full_projection.weight.detach()[candidate_ids],
+                                   requires_grad=False)
+        bias = getattr(full_projection, "bias", None)
+        self.bias = None if bias is None else nn.Parameter(bias.detach()[candidate_ids],
+                                                           requires_grad=False)
+
+    def forward(self, hidden_states):
+        logits = nn.functional.linear(hidden_states, self.weight, self.bias)
+        full = logits.new_full((*logits.shape[:-1], self.vocab_size), float("-inf"))
+        full[..., self.candidate_ids] = logits
+        return full
+
+
+def shortlisted_model(model, candidate_ids):
+    """
+    Per-call view of a MarianMTModel whose output layer is restricted to
+    candidate_ids
+
+    The view is a shallow copy with its own submodule table: every layer and
+    weight is shared with `model`, only lm_head is replaced. The shared model
+    itself is never modified, so other threads can keep generating with it.
+    """
+    full = model.lm_head
+    candidate_ids = torch.as_tensor(candidate_ids, dtype=torch.long, device=full.weight.device)
+    view = copy.copy(model)
+    view._modules = model._modules.copy()
+    view._modules["lm_head"] = ShortlistProjection(full, candidate_ids)
+    return view
+
+
+def check_parity(texts, shortlist, batch_size=8):
+    """
+    Compare shortlisted and full-vocabulary translations
+
+    Returns:
+        dict: exact-match rate, timings and the sentences that differ
+    """
+    from translator import registry, translate_batch
+
+    # Load the model and run one untimed generate so neither timing includes
+    # lazy loading or first-call setup
+    registry.get("en", "hi")
+    translate_batch(texts[:1], batch_size=batch_size)
+    translate_batch(texts[:1], batch_size=batch_size, shortlist=shortlist)
+
+    start = time.perf_counter()
+    full = translate_batch(texts, batch_size=batch_size)
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    short = translate_batch(texts, batch_size=batch_size, shortlist=shortlist)
+    short_time = time.perf_counter() - start
+
+    mismatches = [
+        {"source": s, "full": f, "shortlist": h}
+        for s, f, h in zip(texts, full, short) if f != h
+    ]
+    return {
+        "sentences": len(texts),
+        "exact_match": 1.0 - len(mismatches) / max(len(texts), 1),
+        "full_seconds": full_time,
+        "shortlist_seconds": short_time,
+        "mismatches": mismatches,
+    }
+
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check a Marian vocabulary shortlist")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build a shortlist from a parallel corpus")
+    build.add_argument("--src", required=True, help="Source (English) sentences, one per line")
+    build.add_argument("--tgt", required=True, help="Target (Hindi) sentences, one per line")
+    build.add_argument("--out", default=DEFAULT_SHORTLIST_PATH)
+    build.add_argument("--top-k", type=int, default=50)
+    build.add_argument("--frequent-k", type=int, default=200)
+
+    check = sub.add_parser("check", help="Compare shortlisted and full-vocabulary decoding")
+    check.add_argument("--src", required=True, help="Source (English) sentences, one per line")
+    check.add_argument("--shortlist", default=DEFAULT_SHORTLIST_PATH)
+    check.add_argument("--batch-size", type=int, default=8)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from translator import registry
+        tokenizer, model = registry.get("en", "hi")
+
+        sources, targets = _read_lines(args.src), _read_lines(args.tgt)
+        if len(sources) != len(targets):
+            parser.error(f"{args.src} and {args.tgt} have different line counts")
+        shortlist = build_shortlist(sources, targets, tokenizer, top_k=args.top_k,
+                                    frequent_k=args.frequent_k,
+                                    vocab_size=model.config.decoder_vocab_size)
+        shortlist.save(args.out)
+        print(f"✅ Shortlist for {len(sources)} sentence pairs saved to {args.out}")
+    else:
+        report = check_parity(_read_lines(args.src), Shortlist.load(args.shortlist),
+                              batch_size=args.batch_size)
+        print(f"Sentences:        {report['sentences']}")
+        print(f"Exact match:      {report['exact_match']:.1%}")
+        print(f"Full vocabulary:  {report['full_seconds']:.2f}s")
+        print(f"Shortlist:        {report['shortlist_seconds']:.2f}s")
+        for m in report["mismatches"][:10]:
+            print(f"\n  {m['source']}\n  full:      {m['full']}\n  shortlist: {m['shortlist']}")
+
+
+if __name__ == "__main__":
+    main()
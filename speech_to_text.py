@@ -1,49 +1,57 @@
 import json
-import queue
-import os
+
+from audio_buffer import AudioRingBuffer
+from vosk_models import (  # noqa: F401
+    resolve_vosk_path, load_vosk_model, make_recognizer, strip_unknown, match_command,
+)
 
 try:
     import sounddevice as sd
     from vosk import Model, KaldiRecognizer
     VOSK_AVAILABLE = True
-except ImportError:
+except (ImportError, OSError):
+    # sounddevice raises OSError when the PortAudio library is missing
     VOSK_AVAILABLE = False
     print("Warning: Vosk or sounddevice not available")
 
-def recognize_speech(vosk_path="models/vosk_model", timeout=10):
+
+def recognize_speech(vosk_path="models/vosk_model", timeout=10, phrases=None,
+                     buffer_seconds=5, overflow="drop_oldest", commands=None):
     """
     Recognize speech using Vosk
     
     Args:
         vosk_path: Path to Vosk model
         timeout: Maximum recording time in seconds
+        phrases: Optional phrase list; restricts recognition to these phrases
+        buffer_seconds: Size of the audio ring buffer between the
+            microphone callback and the decoder
+        overflow: What to do when the decoder falls behind and the buffer
+            fills: "drop_oldest", "drop_newest" or "block"
+        commands: Optional control words spotted by a grammar-constrained
+            recognizer running alongside dictation; when one is heard it is
+            returned right away
         
     Returns:
-        str: Recognized text or empty string
+        str: Recognized text, the spotted command, or empty string
     """
     if not VOSK_AVAILABLE:
         print("Error: Speech recognition not available")
         return ""
     
-    # Get absolute path for model
-    if not os.path.isabs(vosk_path):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(current_dir) if 'src' in current_dir else current_dir
-        vosk_path = os.path.join(project_root, vosk_path)
-    
-    if not os.path.exists(vosk_path):
-        print(f"Error: Vosk model not found at {vosk_path}")
-        print("Download a model from https://alphacephei.com/vosk/models")
+    model = load_vosk_model(vosk_path)
+    if model is None:
         return ""
     
+    audio_buffer = None
     try:
         print("\n🎤 Speak something in English...")
         print("   (The system will automatically detect when you stop speaking)")
         
-        model = Model(vosk_path)
-        recognizer = KaldiRecognizer(model, 16000)
+        recognizer = make_recognizer(model, 16000, phrases)
+        command_recognizer = make_recognizer(model, 16000, commands) if commands else None
         
-        audio_queue = queue.Queue()
+        audio_buffer = AudioRingBuffer.for_duration(buffer_seconds, 16000, overflow=overflow)
         recording = True
         silence_frames = 0
         max_silence_frames = 30  # Stop after ~2 seconds of silence
@@ -51,7 +59,7 @@ def recognize_speech(vosk_path="models/vosk_model", timeout=10):
         def callback(indata, frames, time, status):
             if status:
                 print(f"Status: {status}")
-            audio_queue.put(bytes(indata))
+            audio_buffer.write(indata)
         
         with sd.RawInputStream(
             samplerate=16000, 
@@ -63,11 +71,18 @@ def recognize_speech(vosk_path="models/vosk_model", timeout=10):
             print("   [Recording started...]")
             
             while recording:
-                data = audio_queue.get()
+                data = audio_buffer.read(8000)
+                
+                if command_recognizer is not None and command_recognizer.AcceptWaveform(data):
+                    heard = strip_unknown(json.loads(command_recognizer.Result()).get("text", ""))
+                    command = match_command(heard, commands) if heard else None
+                    if command:
+                        print(f"   ✓ Command: {command}")
+                        return command
                 
                 if recognizer.AcceptWaveform(data):
                     result = recognizer.Result()
-                    text = json.loads(result).get("text", "")
+                    text = strip_unknown(json.loads(result).get("text", ""))
                     
                     if text:
                         print(f"   ✓ Recognized: {text}")
@@ -77,7 +92,7 @@ def recognize_speech(vosk_path="models/vosk_model", timeout=10):
                 else:
                     # Partial result - reset silence counter
                     partial = recognizer.PartialResult()
-                    partial_text = json.loads(partial).get("partial", "")
+                    partial_text = strip_unknown(json.loads(partial).get("partial", ""))
                     if partial_text:
                         silence_frames = 0
                     else:
@@ -86,7 +101,7 @@ def recognize_speech(vosk_path="models/vosk_model", timeout=10):
                 # Stop if too much silence
                 if silence_frames > max_silence_frames:
                     final_result = recognizer.FinalResult()
-                    text = json.loads(final_result).get("text", "")
+                    text = strip_unknown(json.loads(final_result).get("text", ""))
                     if text:
                         print(f"   ✓ Final: {text}")
                         return text
@@ -97,6 +112,29 @@ def recognize_speech(vosk_path="models/vosk_model", timeout=10):
     except Exception as e:
         print(f"Error in speech recognition: {e}")
         return ""
+    finally:
+        if audio_buffer is not None:
+            audio_buffer.close()
+            if audio_buffer.overruns:
+                stats = audio_buffer.stats()
+                print(f"   ⚠ Audio buffer overran {stats['overruns']} times "
+                      f"({stats['dropped_frames']} frames dropped)")
+
+
+def recognize_command(commands, vosk_path="models/vosk_model", timeout=10):
+    """
+    Listen for one of a small set of control words (e.g. "stop")
+
+    Args:
+        commands: List of command words/phrases
+        vosk_path: Path to Vosk model
+        timeout: Maximum recording time in seconds
+
+    Returns:
+        str: The matched command or None
+    """
+    text = recognize_speech(vosk_path, timeout, phrases=commands)
+    return match_command(text, commands) if text else None
 
 
 def test_microphone():
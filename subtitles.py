@@ -0,0 +1,264 @@
+"""
+Long-form audio to subtitles
+
+Reads a WAV recording through a memory-mapped view, transcribes it with
+Vosk (word timestamps enabled) and writes time-aligned English and Hindi
+subtitles as SRT or WebVTT.
+
+Usage:
+    python subtitles.py recording.wav [--out-dir subs] [--format srt|vtt]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+from vosk_models import load_vosk_model
+
+try:
+    from vosk import KaldiRecognizer
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+    print("Warning: Vosk not available")
+
+
+class WavMap:
+    """Memory-mapped view over the PCM data of a WAV file"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty WAV file: {path}")
+        try:
+            self._parse_header(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self, path):
+        mm = self._mm
+        if len(mm) < 12 or mm[0:4] != b"RIFF" or mm[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {path}")
+
+        fmt = None
+        offset = 12
+        while offset + 8 <= len(mm):
+            chunk_id = mm[offset:offset + 4]
+            chunk_size = struct.unpack("<I", mm[offset + 4:offset + 8])[0]
+            body = offset + 8
+            if chunk_id == b"fmt ":
+                fmt = struct.unpack("<HHIIHH", mm[body:body + 16])
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"WAV data chunk before fmt chunk: {path}")
+                self.data_offset = body
+                # Recorders that never finalise the header leave size at 0/0xFFFFFFFF
+                if chunk_size in (0, 0xFFFFFFFF):
+                    chunk_size = len(mm) - body
+                self.data_size = min(chunk_size, len(mm) - body)
+                break
+            offset = body + chunk_size + (chunk_size & 1)
+        else:
+            raise ValueError(f"No data chunk in WAV file: {path}")
+
+        audio_format, channels, sample_rate, _, block_align, bits = fmt
+        if audio_format != 1 or bits != 16 or channels != 1:
+            raise ValueError(
+                f"{path}: expected 16-bit mono PCM, got format={audio_format} "
+                f"channels={channels} bits={bits}"
+            )
+        self.sample_rate = sample_rate
+        self.block_align = block_align
+
+    @property
+    def duration(self):
+        return self.data_size / float(self.block_align * self.sample_rate)
+
+    def chunks(self, frames=4000):
+        """Yield raw PCM chunks of up to `frames` samples"""
+        step = frames * self.block_align
+        end = self.data_offset + self.data_size
+        for start in range(self.data_offset, end, step):
+            yield self._mm[start:min(start + step, end)]
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _split_segment(words, max_chars, max_duration):
+    """Split a recognised utterance into subtitle-sized cues on word boundaries"""
+    cues = []
+    current = []
+    for word in words:
+        if current:
+            text_len = sum(len(w["word"]) + 1 for w in current) + len(word["word"])
+            too_long = text_len > max_chars
+            too_slow = word["end"] - current[0]["start"] > max_duration
+            if too_long or too_slow:
+                cues.append(current)
+                current = []
+        current.append(word)
+    if current:
+        cues.append(current)
+
+    return [
+        {
+            "start": cue[0]["start"],
+            "end": cue[-1]["end"],
+            "text": " ".join(w["word"] for w in cue),
+            "words": cue,
+        }
+        for cue in cues
+    ]
+
+
+def transcribe_wav(wav_path, vosk_path="models/vosk_model", max_chars=84,
+                   max_duration=7.0, frames_per_chunk=4000):
+    """
+    Transcribe a WAV file into time-aligned segments
+
+    Args:
+        wav_path: Path to a 16-bit mono PCM WAV file
+        vosk_path: Path to Vosk model
+        max_chars: Longest subtitle line before a segment is split
+        max_duration: Longest subtitle (seconds) before a segment is split
+        frames_per_chunk: Samples fed to the recognizer per call
+
+    Returns:
+        list: Segments as dicts with start, end, text and words
+
+    Raises:
+        RuntimeError: If Vosk or the Vosk model is not available
+    """
+    if not VOSK_AVAILABLE:
+        raise RuntimeError("Speech recognition not available (vosk not installed)")
+
+    model = load_vosk_model(vosk_path)
+    if model is None:
+        raise RuntimeError(f"Vosk model not found at {vosk_path}")
+
+    segments = []
+
+    def collect(result_json):
+        words = json.loads(result_json).get("result", [])
+        if words:
+            segments.extend(_split_segment(words, max_chars, max_duration))
+
+    with WavMap(wav_path) as wav:
+        recognizer = KaldiRecognizer(model, wav.sample_rate)
+        recognizer.SetWords(True)
+        for data in wav.chunks(frames_per_chunk):
+            if recognizer.AcceptWaveform(data):
+                collect(recognizer.Result())
+        collect(recognizer.FinalResult())
+
+    return segments
+
+
+def translate_segments(segments, batch_size=8):
+    """Attach a Hindi translation to every segment, translating in batches"""
+    from translator import translate_batch
+
+    hindi = translate_batch([s["text"] for s in segments], batch_size=batch_size)
+    for segment, text in zip(segments, hindi):
+        segment["hindi"] = text
+    return segments
+
+
+def format_timestamp(seconds, separator=","):
+    """Format seconds as HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (VTT)"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def write_srt(segments, path, key="text"):
+    """Write segments to an SRT file using segment[key] as the cue text"""
+    with open(path, "w", encoding="utf-8") as f:
+        for index, segment in enumerate(segments, 1):
+            f.write(f"{index}\n")
+            f.write(f"{format_timestamp(segment['start'])} --> "
+                    f"{format_timestamp(segment['end'])}\n")
+            f.write(f"{segment.get(key, '')}\n\n")
+
+
+def write_vtt(segments, path, key="text"):
+    """Write segments to a WebVTT file using segment[key] as the cue text"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("WEBVTT\n\n")
+        for segment in segments:
+            f.write(f"{format_timestamp(segment['start'], '.')} --> "
+                    f"{format_timestamp(segment['end'], '.')}\n")
+            f.write(f"{segment.get(key, '')}\n\n")
+
+
+def audio_to_subtitles(wav_path, out_dir=None, fmt="srt", translate=True,
+                       vosk_path="models/vosk_model", batch_size=8):
+    """
+    Transcribe a WAV file and write English (and Hindi) subtitle files
+
+    Returns:
+        list: Paths of the subtitle files written
+    """
+    segments = transcribe_wav(wav_path, vosk_path=vosk_path)
+    if translate and segments:
+        translate_segments(segments, batch_size=batch_size)
+
+    out_dir = out_dir or os.path.dirname(os.path.abspath(wav_path))
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(wav_path))[0]
+    writer = write_vtt if fmt == "vtt" else write_srt
+
+    written = []
+    tracks = [("en", "text")] + ([("hi", "hindi")] if translate else [])
+    for lang, key in tracks:
+        path = os.path.join(out_dir, f"{base}.{lang}.{fmt}")
+        writer(segments, path, key=key)
+        written.append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate English/Hindi subtitles from a WAV file")
+    parser.add_argument("wav", help="16-bit mono PCM WAV file")
+    parser.add_argument("--out-dir", help="Directory for subtitle files (default: next to the WAV)")
+    parser.add_argument("--format", choices=["srt", "vtt"], default="srt")
+    parser.add_argument("--no-translate", action="store_true", help="Only write English subtitles")
+    parser.add_argument("--batch-size", type=int, default=8, help="Segments per translation batch")
+    parser.add_argument("--vosk-path", default="models/vosk_model")
+    args = parser.parse_args()
+
+    try:
+        paths = audio_to_subtitles(
+            args.wav,
+            out_dir=args.out_dir,
+            fmt=args.format,
+            translate=not args.no_translate,
+            vosk_path=args.vosk_path,
+            batch_size=args.batch_size,
+        )
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    for path in paths:
+        print(f"✅ Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Multi-process translation worker pool
+
+A single Python process running MarianMTModel.generate cannot keep a large
+machine busy: the GIL and per-call overhead dominate small requests. This pool
+loads the model once, moves its weights into shared memory and starts N
+worker processes that all map the same weights, so total memory stays close to
+one model copy. Each worker uses a fixed number of intra-op threads and pulls
+requests from one shared queue, which balances load across workers. When the
+backlog is larger than the number of workers, a worker may micro-batch
+several queued requests into one generate() call.
+
+If a worker process dies the pool is marked broken and every outstanding
+request fails, as with concurrent.futures.ProcessPoolExecutor. A watchdog
+thread waits on the worker sentinels, so a death is noticed immediately even
+while other workers keep returning results.
+
+Workers are started with "spawn" by default: the parent has already loaded
+the model (and possibly run torch ops), so forking it could copy OpenMP
+thread-pool state into the children and deadlock them. As with any spawn-based
+pool, create it under an `if __name__ == "__main__":` guard in scripts.
+
+Usage:
+    pool = TranslationWorkerPool(num_workers=8, threads_per_worker=4)
+    hindi = pool.translate("How are you?")
+    pool.shutdown()
+"""
+
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+import torch
+import torch.multiprocessing as mp
+
+_STOP = None
+
+
+def _backlog(tasks):
+    try:
+        return tasks.qsize()
+    except NotImplementedError:
+        # qsize() is unavailable on macOS; never micro-batch there
+        return 0
+
+
+def _worker_main(worker_id, model, tokenizer, tasks, results, threads, batch_size,
+                 num_workers):
+    """Worker process loop: pull requests, micro-batch them and translate"""
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already initialised (inherited through fork); intra-op setting still applies
+        pass
+
+    model.eval()
+    while True:
+        task = tasks.get()
+        if task is _STOP:
+            break
+        batch = [task]
+        # Only take extra requests when every other worker already has work
+        while len(batch) < batch_size and _backlog(tasks) > num_workers:
+            try:
+                task = tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is _STOP:
+                tasks.put(_STOP)
+                break
+            batch.append(task)
+
+        ids = [request_id for request_id, _ in batch]
+        texts = [text for _, text in batch]
+        try:
+            with torch.inference_mode():
+                encoded = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+                generated = model.generate(**encoded)
+            decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
+            for request_id, hindi in zip(ids, decoded):
+                results.put((request_id, worker_id, hindi, None))
+        except Exception as e:
+            for request_id in ids:
+                results.put((request_id, worker_id, None, f"{type(e).__name__}: {e}"))
+
+
+class TranslationWorkerPool:
+    """
+    Pool of translation processes sharing one copy of the model weights
+
+    Args:
+        num_workers: Worker processes (default: cores // threads_per_worker)
+        threads_per_worker: torch intra-op threads per worker
+        batch_size: Most requests a worker translates in one generate() call;
+            extra requests are only batched while the backlog exceeds the
+            number of workers
+        start_method: "spawn" (default), "forkserver" or "fork"; weights are
+            in shared memory either way. Only use "fork" if the parent has not
+            run any torch ops yet, since OpenMP threads do not survive fork.
+        model: MarianMTModel to share (defaults to the registry's src-tgt model)
+        tokenizer: MarianTokenizer (defaults to the registry's src-tgt tokenizer)
+        src: Source language code used when model/tokenizer are not given
+        tgt: Target language code used when model/tokenizer are not given
+    """
+
+    def __init__(self, num_workers=None, threads_per_worker=1, batch_size=4,
+                 start_method="spawn", model=None, tokenizer=None, src="en", tgt="hi"):
+        if model is None or tokenizer is None:
+            from translator import registry
+            pair_tokenizer, pair_model = registry.get(src, tgt)
+            model = model or pair_model
+            tokenizer = tokenizer or pair_tokenizer
+
+        cores = os.cpu_count() or 1
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.num_workers = num_workers or max(1, cores // self.threads_per_worker)
+
+        model.eval()
+        model.share_memory()
+        self.shared_bytes = sum(t.numel() * t.element_size()
+                                for t in itertools.chain(model.parameters(), model.buffers()))
+
+        ctx = mp.get_context(start_method)
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._workers = [
+            ctx.Process(
+                target=_worker_main,
+                args=(i, model, tokenizer, self._tasks, self._results,
+                      self.threads_per_worker, batch_size, self.num_workers),
+                daemon=True,
+            )
+            for i in range(self.num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._broken = None
+        self._ids = itertools.count()
+        self.completed_per_worker = [0] * self.num_workers
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+        self._watchdog = threading.Thread(target=self._watch, daemon=True)
+        self._watchdog.start()
+
+    def _fail_outstanding(self, message):
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.set_exception(RuntimeError(message))
+
+    def _check_workers(self):
+        """Mark the pool broken if a worker died outside of shutdown"""
+        if self._shutdown or self._broken:
+            return
+        dead = [i for i, w in enumerate(self._workers) if not w.is_alive()]
+        if not dead:
+            return
+        codes = ", ".join(f"{i} (exit code {self._workers[i].exitcode})" for i in dead)
+        with self._lock:
+            self._broken = f"Translation worker(s) {codes} died; the pool is broken"
+        print(f"Error: {self._broken}")
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.terminate()
+        self._fail_outstanding(self._broken)
+
+    def _watch(self):
+        """Wake up as soon as any worker exits, independent of result traffic"""
+        sentinels = [worker.sentinel for worker in self._workers]
+        while not (self._shutdown or self._broken):
+            if wait(sentinels, timeout=0.5):
+                self._check_workers()
+
+    def _collect(self):
+        while True:
+            item = self._results.get()
+            if item is _STOP:
+                break
+            request_id, worker_id, hindi, error = item
+            with self._lock:
+                future = self._futures.pop(request_id, None)
+                self.completed_per_worker[worker_id] += 1
+            if future is None:
+                continue
+            if error is None:
+                future.set_result(hindi)
+            else:
+                future.set_exception(RuntimeError(f"Translation worker {worker_id} failed: {error}"))
+
+    def submit(self, text):
+        """Queue one English string; returns a Future resolving to Hindi"""
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit to a translation pool after shutdown")
+            if self._broken:
+                raise RuntimeError(self._broken)
+            if not text or text.strip() == "":
+                future.set_result("")
+                return future
+            request_id = next(self._ids)
+            self._futures[request_id] = future
+        self._tasks.put((request_id, text))
+        return future
+
+    def translate(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    def translate_many(self, texts, timeout=None):
+        """Translate a list of strings across all workers, preserving order"""
+        futures = [self.submit(t) for t in texts]
+        return [f.result(timeout) for f in futures]
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._futures)
+            completed = list(self.completed_per_worker)
+        return {
+            "workers": self.num_workers,
+            "threads_per_worker": self.threads_per_worker,
+            "shared_weight_bytes": self.shared_bytes,
+            "pending": pending,
+            "broken": self._broken,
+            "completed_per_worker": completed,
+        }
+
+    def shutdown(self, timeout=10):
+        """Finish queued requests, stop the workers and fail anything left"""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        for _ in self._workers:
+            self._tasks.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+        self._results.put(_STOP)
+        self._collector.join(timeout)
+        self._watchdog.join(timeout)
+        self._fail_outstanding("Translation pool shut down before the request finished")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
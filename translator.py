@@ -1,4 +1,6 @@
 from transformers import MarianMTModel, MarianTokenizer
+from collections import OrderedDict
+import threading
 import os
 
 # Get the project root directory
@@ -6,35 +8,205 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir) if 'src' in current_dir else current_dir
 
 # Use relative path to avoid space issues
-model_path = os.path.join(project_root, "models", "opus-mt-en-hi")
-
-# Initialize model and tokenizer
-try:
-    if os.path.exists(model_path):
-        print(f"Loading model from: {model_path}")
-        tokenizer = MarianTokenizer.from_pretrained(model_path, local_files_only=True)
-        model = MarianMTModel.from_pretrained(model_path, local_files_only=True)
-    else:
-        print("Local model not found, loading from HuggingFace...")
-        model_name = "Helsinki-NLP/opus-mt-en-hi"
+models_dir = os.path.join(project_root, "models")
+
+
+def _load_pair(models_dir, src, tgt):
+    """Load a Marian pair from models_dir, falling back to HuggingFace"""
+    local_path = os.path.join(models_dir, f"opus-mt-{src}-{tgt}")
+    model_name = f"Helsinki-NLP/opus-mt-{src}-{tgt}"
+    try:
+        if os.path.exists(local_path):
+            print(f"Loading model from: {local_path}")
+            tokenizer = MarianTokenizer.from_pretrained(local_path, local_files_only=True)
+            model = MarianMTModel.from_pretrained(local_path, local_files_only=True)
+        else:
+            print(f"Local model not found, loading {model_name} from HuggingFace...")
+            tokenizer = MarianTokenizer.from_pretrained(model_name)
+            model = MarianMTModel.from_pretrained(model_name)
+    except Exception as e:
+        print(f"Error loading model: {e}")
+        print("Falling back to HuggingFace...")
         tokenizer = MarianTokenizer.from_pretrained(model_name)
         model = MarianMTModel.from_pretrained(model_name)
-except Exception as e:
-    print(f"Error loading model: {e}")
-    print("Falling back to HuggingFace...")
-    model_name = "Helsinki-NLP/opus-mt-en-hi"
-    tokenizer = MarianTokenizer.from_pretrained(model_name)
-    model = MarianMTModel.from_pretrained(model_name)
+    model.eval()
+    return tokenizer, model
 
-def translate_to_hindi(text):
-    """Translate English text to Hindi"""
+
+def estimate_pair_bytes(models_dir, src, tgt):
+    """
+    Expected resident size of a pair before loading it
+
+    Marian checkpoints are stored in float32, so the weight file size is a
+    close estimate. Returns 0 when there is no local model folder.
+    """
+    local_path = os.path.join(models_dir, f"opus-mt-{src}-{tgt}")
+    sizes = [
+        os.path.getsize(os.path.join(local_path, name))
+        for name in ("model.safetensors", "pytorch_model.bin")
+        if os.path.isfile(os.path.join(local_path, name))
+    ]
+    # from_pretrained loads only one of the weight files
+    return max(sizes, default=0)
+
+
+def model_memory_bytes(model):
+    """Resident size of a model's parameters and buffers in bytes"""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class ModelRegistry:
+    """
+    On-demand Marian models for several language pairs
+
+    Pairs are loaded from models_dir/opus-mt-{src}-{tgt} the first time they
+    are requested. Before a pair is loaded its size is estimated from its
+    weight file and the least recently used models are evicted until it fits,
+    so peak usage stays within the memory budget instead of reaching budget
+    plus the new model. After loading, the measured size replaces the estimate
+    (the model just requested is always kept).
+
+    Args:
+        models_dir: Directory holding opus-mt-* model folders
+        memory_budget_mb: Total resident size allowed for loaded models
+    """
+
+    def __init__(self, models_dir=models_dir, memory_budget_mb=2048):
+        self.models_dir = models_dir
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._reserved_bytes = 0
+
+    def get(self, src="en", tgt="hi"):
+        """Return (tokenizer, model) for a pair, loading it if needed"""
+        key = (src, tgt)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][:2]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other pairs stay usable meanwhile
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key][:2]
+                # Make room first; the reservation covers concurrent loads
+                estimate = estimate_pair_bytes(self.models_dir, src, tgt)
+                self._evict(incoming=estimate, keep=0)
+                self._reserved_bytes += estimate
+            try:
+                tokenizer, model = _load_pair(self.models_dir, src, tgt)
+            finally:
+                with self._lock:
+                    self._reserved_bytes -= estimate
+            size = model_memory_bytes(model)
+            with self._lock:
+                self._models[key] = (tokenizer, model, size)
+                self._evict()
+            return tokenizer, model
+
+    def _evict(self, incoming=0, keep=1):
+        """Drop least recently used models until incoming bytes fit the budget"""
+        while (len(self._models) > keep and
+               self.resident_bytes() + self._reserved_bytes + incoming > self.memory_budget_bytes):
+            (src, tgt), _ = self._models.popitem(last=False)
+            print(f"Evicting translation model opus-mt-{src}-{tgt}")
+
+    def resident_bytes(self):
+        return sum(size for _, _, size in self._models.values())
+
+    def unload(self, src, tgt):
+        with self._lock:
+            self._models.pop((src, tgt), None)
+
+    def available_pairs(self):
+        """Language pairs with a local model folder"""
+        if not os.path.isdir(self.models_dir):
+            return []
+        pairs = []
+        for name in sorted(os.listdir(self.models_dir)):
+            parts = name.split("-")
+            if len(parts) == 4 and parts[:2] == ["opus", "mt"]:
+                pairs.append((parts[2], parts[3]))
+        return pairs
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": [
+                    {"pair": f"{src}-{tgt}", "bytes": size}
+                    for (src, tgt), (_, _, size) in self._models.items()
+                ],
+                "resident_bytes": self.resident_bytes(),
+                "memory_budget_bytes": self.memory_budget_bytes,
+            }
+
+
+registry = ModelRegistry()
+
+
+def __getattr__(name):
+    # Keep `translator.model` / `translator.tokenizer` working for en-hi
+    # without pinning the model outside the registry
+    if name in ("tokenizer", "model"):
+        tokenizer, model = registry.get("en", "hi")
+        return tokenizer if name == "tokenizer" else model
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def translate_batch(texts, batch_size=8, shortlist=None, src="en", tgt="hi"):
+    """
+    Translate a list of strings in padded batches
+
+    Args:
+        texts: List of source-language strings
+        batch_size: Number of strings passed to generate() at once
+        shortlist: Optional shortlist.Shortlist; restricts the output layer
+            to likely target tokens for each batch
+        src: Source language code
+        tgt: Target language code
+
+    Returns:
+        list: Translations, aligned with texts (empty input stays empty)
+    """
+    results = [""] * len(texts)
+    pending = [(i, t) for i, t in enumerate(texts) if t and t.strip()]
+    if not pending:
+        return results
+
+    tokenizer, model = registry.get(src, tgt)
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        batch = tokenizer([t for _, t in chunk], return_tensors="pt",
+                          padding=True, truncation=True)
+        if shortlist is not None:
+            from shortlist import shortlisted_model
+            generator = shortlisted_model(model, shortlist.candidates(batch["input_ids"]))
+        else:
+            generator = model
+        generated = generator.generate(**batch)
+        decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
+        for (i, _), translation in zip(chunk, decoded):
+            results[i] = translation
+
+    return results
+
+
+def translate(text, src="en", tgt="hi"):
+    """Translate text between any pair available to the registry"""
     if not text or text.strip() == "":
         return ""
-    
+    return translate_batch([text], src=src, tgt=tgt)[0]
+
+
+def translate_to_hindi(text):
+    """Translate English text to Hindi"""
     try:
-        batch = tokenizer.prepare_seq2seq_batch([text], return_tensors="pt")
-        generated = model.generate(**batch)
-        hindi_text = tokenizer.batch_decode(generated, skip_special_tokens=True)[0]
-        return hindi_text
+        return translate(text, "en", "hi")
     except Exception as e:
-        return f"Translation error: {str(e)}"
\ No newline at end of file
+        return f"Translation error: {str(e)}"
@@ -0,0 +1,93 @@
+"""
+Vosk model loading and recognizer helpers shared by the live and offline
+recognition tools
+
+Kept free of any audio-device dependency so file-based tools (subtitles)
+work on headless hosts without PortAudio.
+"""
+
+import json
+import os
+import re
+
+_model_cache = {}
+
+
+def resolve_vosk_path(vosk_path="models/vosk_model"):
+    """Resolve a (possibly relative) Vosk model path against the project root"""
+    if not os.path.isabs(vosk_path):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(current_dir) if 'src' in current_dir else current_dir
+        vosk_path = os.path.join(project_root, vosk_path)
+    return vosk_path
+
+
+def load_vosk_model(vosk_path="models/vosk_model"):
+    """
+    Load a Vosk model once and reuse it for every recognizer
+
+    Args:
+        vosk_path: Path to Vosk model
+
+    Returns:
+        Model: Shared Vosk model, or None if it cannot be found
+    """
+    vosk_path = resolve_vosk_path(vosk_path)
+    if vosk_path in _model_cache:
+        return _model_cache[vosk_path]
+
+    if not os.path.exists(vosk_path):
+        print(f"Error: Vosk model not found at {vosk_path}")
+        print("Download a model from https://alphacephei.com/vosk/models")
+        return None
+
+    from vosk import Model
+    model = Model(vosk_path)
+    _model_cache[vosk_path] = model
+    return model
+
+
+def make_recognizer(model, sample_rate=16000, phrases=None):
+    """
+    Create a KaldiRecognizer, optionally constrained to a phrase list
+
+    With phrases the decoder only searches the given words/phrases (plus
+    "[unk]" for anything else), which is much cheaper than open dictation.
+    The model is not reloaded, so switching modes only costs a new recognizer.
+
+    Args:
+        model: Loaded Vosk model
+        sample_rate: Audio sample rate in Hz
+        phrases: Optional list of phrases for grammar-constrained recognition
+
+    Returns:
+        KaldiRecognizer
+    """
+    from vosk import KaldiRecognizer
+
+    if not phrases:
+        return KaldiRecognizer(model, sample_rate)
+    grammar = [p.lower() for p in phrases]
+    if "[unk]" not in grammar:
+        grammar.append("[unk]")
+    return KaldiRecognizer(model, sample_rate, json.dumps(grammar))
+
+
+def strip_unknown(text):
+    """Drop the "[unk]" tokens a grammar-constrained recognizer emits"""
+    return " ".join(w for w in text.split() if w != "[unk]")
+
+
+def match_command(text, commands):
+    """
+    Return the command spoken in recognized text, or None
+
+    Commands match on whole words only ("stop" does not match "nonstop"),
+    and longer phrases win over commands that are their prefix.
+    """
+    words = " ".join(text.lower().split())
+    for command in sorted(commands, key=lambda c: len(c.split()), reverse=True):
+        phrase = " ".join(command.lower().split())
+        if re.search(r"(?<!\S)" + re.escape(phrase) + r"(?!\S)", words):
+            return command
+    return None